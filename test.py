@@ -1,8 +1,25 @@
 #!/usr/bin/env python3
-# Standard library only: subprocess, hashlib, json, argparse, pathlib, sys, os, textwrap
-import subprocess, sys, os, hashlib, argparse, json
+# Standard library: subprocess, sys, os, hashlib, argparse, json, mmap, shutil,
+# fnmatch, re, inspect, stat, threading, heapq, itertools, time,
+# concurrent.futures, dataclasses, typing, pathlib, fcntl (POSIX, optional)
+# Third-party imports are optional: xxhash speeds up fixture bookkeeping when
+# installed
+import subprocess, sys, os, hashlib, argparse, json, mmap, shutil, fnmatch, re, inspect, stat, threading, heapq, itertools, time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, fixtures are always regenerated
+    fcntl = None
+
+try:
+    import xxhash
+except ImportError:  # optional: only speeds up fixture bookkeeping
+    xxhash = None
+
 ROOT = Path(__file__).resolve().parent
 FIX = ROOT / "fixtures"
 
@@ -30,12 +47,262 @@ VERSION = repo_version()
 VERSION_LINE = f"fiskta - (fi)nd (sk)ip (ta)ke v{VERSION}\n"
 PROGRAM_FAIL_EXIT = 1
 
+MANIFEST = FIX / ".manifest.json"
+
+# Fixture identity only needs a non-cryptographic hash; xxh3 is far faster than
+# sha256 on the multi-MiB fixtures. Entries made with a different hash are stale.
+if xxhash is not None:
+    FIXTURE_HASH, fixture_hasher = "xxh3_128", xxhash.xxh3_128
+else:
+    FIXTURE_HASH, fixture_hasher = "sha256", hashlib.sha256
+
+def fast_hash(data: bytes) -> str:
+    return fixture_hasher(data).hexdigest()
+
+def fast_hash_file(path: Path) -> str:
+    """fast_hash() of a file's contents, hashed straight from a read-only mapping."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return fast_hash(b"")  # empty files cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return fixture_hasher(mm).hexdigest()
+
+# Fixture name -> {"size", "mtime_ns", "hash", "digest"} as of the last time it was written
+_manifest: dict[str, dict] = {}
+
+def load_manifest():
+    _manifest.clear()
+    try:
+        _manifest.update(json.loads(MANIFEST.read_text()))
+    except (FileNotFoundError, ValueError):
+        pass
+
+def save_manifest():
+    write_atomically(MANIFEST, (json.dumps(_manifest, indent=1, sort_keys=True).encode("utf-8"),))
+
+def recorded_digest(path: Path) -> str | None:
+    """The manifest digest of path, or None if the file changed since it was recorded.
+
+    Only the file's size and mtime are checked against the manifest entry, so
+    an unchanged fixture is never read back.
+    """
+    rec = _manifest.get(path.name)
+    if rec is None or rec.get("hash") != FIXTURE_HASH:
+        return None
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    if st.st_size != rec["size"] or st.st_mtime_ns != rec["mtime_ns"]:
+        return None
+    return rec["digest"]
+
+def fixture_current(path: Path, digest: str, size: int) -> bool:
+    """True if path already holds content with the given digest and size.
+
+    The manifest answers this without I/O. Failing that (no manifest, or a
+    stale entry), a file of the right size is hashed and, if it matches,
+    adopted into the manifest rather than rewritten.
+    """
+    if recorded_digest(path) == digest:
+        return True
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return False
+    if st.st_size != size or fast_hash_file(path) != digest:
+        return False
+    record_fixture(path, digest)
+    return True
+
+def record_fixture(path: Path, digest: str):
+    st = path.stat()
+    _manifest[path.name] = dict(size=st.st_size, mtime_ns=st.st_mtime_ns, hash=FIXTURE_HASH, digest=digest)
+
+# Fixtures already materialised by this process; make_fixtures() is idempotent
+_written: set[str] = set()
+
+# Fixtures are written with raw fds: make_fixtures() creates FIX once up front,
+# so there is no per-file mkdir or buffered-file setup.
+WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+def write_all(fd: int, data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+def write_atomically(path: Path, chunks):
+    """Write chunks to a temporary sibling of path, then rename it into place.
+
+    An interrupted run can therefore never leave a truncated fixture behind
+    that a later size check would accept.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        fd = os.open(tmp, WRITE_FLAGS, 0o644)
+        try:
+            for chunk in chunks:
+                write_all(fd, chunk)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
 def write(path: Path, data: bytes):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "wb") as f:
-        f.write(data)
+    key = str(path)
+    if key in _written or (_rebuild_only is not None and path.name not in _rebuild_only):
+        return
+    digest = fast_hash(data)
+    if not fixture_current(path, digest, len(data)):
+        write_atomically(path, (data,))
+        record_fixture(path, digest)
+    _written.add(key)
+
+FILL_CHUNK = 64 * 1024
+
+def filled_chunks(size: int, fill: bytes, patches):
+    """Yield size bytes of repeated fill, FILL_CHUNK at a time, with patches overlaid.
+
+    patches is a sequence of (offset, bytes) pairs.
+    """
+    block = fill * max(1, FILL_CHUNK // len(fill))
+    pos = 0
+    while pos < size:
+        end = min(pos + len(block), size)
+        chunk = block if end - pos == len(block) else block[:end - pos]
+        hits = [(off, data) for off, data in patches if off < end and off + len(data) > pos]
+        if hits:
+            chunk = bytearray(chunk)
+            for off, data in hits:
+                lo, hi = max(off, pos), min(off + len(data), end)
+                chunk[lo - pos:hi - pos] = data[lo - off:hi - off]
+            chunk = bytes(chunk)
+        yield chunk
+        pos = end
+
+def write_filled(path: Path, size: int, fill: bytes = b"A", patches=()):
+    """Like write(), for large fixtures that are mostly one repeated byte pattern.
+
+    The content is streamed from a small reused buffer instead of being built
+    in memory first.
+    """
+    key = str(path)
+    if key in _written or (_rebuild_only is not None and path.name not in _rebuild_only):
+        return
+    h = fixture_hasher()
+    for chunk in filled_chunks(size, fill, patches):
+        h.update(chunk)
+    digest = h.hexdigest()
+    if not fixture_current(path, digest, size):
+        write_atomically(path, filled_chunks(size, fill, patches))
+        record_fixture(path, digest)
+    _written.add(key)
+
+# Canonical size and sha256 of every fixture make_fixtures() produces. A run
+# rebuilds fixtures that are missing, resized or modified, and all of them when
+# the generator code changes; whatever it rebuilt is then checked against this
+# table. Regenerate the table with `test.py make-fixtures --print-manifest`
+# after changing a fixture.
+EXPECTED_FIXTURES = {
+    "backward-find.txt": (29, "b0cb5ebc7543e9d578462d5385597fe22def3b7c94760f8448c0fb33d840d163"),
+    "big-forward.bin": (20971520, "cd7ac64594fad9b3b200d8b0f25741dbd401eef9fcf605256301bd449852341e"),
+    "binary-data.bin": (37, "b4a14364449466705269981ae2a2280ceb79e037cdf5e1216d8498376a1c6c57"),
+    "binary-large.bin": (10485760, "905191a6300bc9d3aa37f60c8c70cc3bb1ab9b4ad10a13ded54a40ac1ff0397e"),
+    "binary-patterns.bin": (64, "cd383693cc45a0f9ba67cff277082c1813db44cdd494bae97b03056bb532f37d"),
+    "commands_take_plus_2b.txt": (9, "f7ce76dbed1c3011fd9a0301cd5df607098369ed2a8b243590be65859e74e2c1"),
+    "cr-only.txt": (18, "57949532ad90f6dfd85a6a0ca904187823b1d53c2342edae4dd0429aeb70f03d"),
+    "crlf-boundary.txt": (3004, "61db799487b231dbcf691eb16710550dd1f7e9e6285c9bd6f43047c1ea933bef"),
+    "crlf-comprehensive.txt": (21, "b252911332d37b7c8a89bb03f3a913ff43de825172e78b86c09a31168f5cbefd"),
+    "crlf-large.txt": (1000, "7075a1d704607b2beea3fc7ce7e9d03bbeaecc3138fd6b8ff7dbd0bbac65209b"),
+    "crlf-no-final-lf.txt": (19, "9d3bcfa6fbc57335b73684667bcd782e47b75d39f44f4b97d33aafb02422e1dc"),
+    "crlf.txt": (7, "03ca4dca076bd048283d9aa18a383adf7903fe51db430f2f81ebf5f34dec6888"),
+    "edge-cases.txt": (1163, "a4dfdf1a31e4d03b039a4b696c8625899c1ab4a8981dcc1d75b2afb72735e9eb"),
+    "empty.txt": (0, "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"),
+    "hex-test.bin": (17, "7250ca68b6cfb255d4abbe97095a2c8ebda62f02be30077e3aa45d865e05670b"),
+    "label-offset.txt": (6, "66a0d09ef2a9769d610b8b0e8b7af426fa1a0114e44ec2be7c4a0402b6681336"),
+    "labels-evict.txt": (36, "74e7e5bb9d22d6db26bf76946d40fff3ea9f0346b884fd0694920fccfad15e33"),
+    "large-lines.txt": (20080, "a225524ad7061fa73e274854156fa3fde46c1e2f251452e557f066f3805ab0a6"),
+    "lines.txt": (105, "3bd16ea91ca58eca01e5d4fdf218fd2c68f238da22db3f54f7ccbe3a9d73b176"),
+    "longline-left.bin": (12582912, "ce7b605e9791be19c0b665f584763938d2323668f45f5283ed2b1bd685dbfbb3"),
+    "longline-right.bin": (12582950, "4321a81613dcf1e81b2e05e35507e4260d82a913d679ad08384d7f96cf51e0f1"),
+    "mixed-line-endings.txt": (42, "8bd05008caaaad2f3299eeebd29d0f319387ae823afe2a0f056fd63d787fdf87"),
+    "multiline.txt": (368, "3acdd331e0164a30885be36d82e7d4821de97e47c675fb45ae10fbd045036ab2"),
+    "nested-sections.txt": (222, "312b8e39e08e751af5dfee29e7a31036fa1160680821aad79e89919d5500ec34"),
+    "overlap.txt": (10, "72399361da6a7754fec986dca5b7cbaf1c810a28ded4abaf56b2106d06cb78b0"),
+    "repeated-patterns.txt": (811, "81ccc7ae3f90579833e74d3e66da9118b486f9d839bd2d135889da63124273ae"),
+    "single-line-with-lf.txt": (25, "f970b7ba7ec846a97e01e3773c374bac2157218f8751e76bad1966829f2557e4"),
+    "single-line.txt": (27, "b9c9e70148d6baeb1904df577ca96b205bf08f8ec83b3507980de88cb537e8bd"),
+    "small.txt": (59, "a72411f51129e91e80b9ba2edd396e546b46029e2cbde4a7da880fdafd6fe47a"),
+    "take-until-empty.txt": (9, "be43a525f51a892bb544800ec9545b40f50ab8afc467ac0670629f8c3f68fabb"),
+    "unicode-test.txt": (38, "3e078c9e2e86d5f4d3ae515021e30ee1a68eb0956f820267986607a55259921e"),
+    "utf8-boundary.bin": (5, "ac6dbe25c0c20f48d8ff142ca49cb5a5ad558ae1db59f938bb62cdfeaa5c2b52"),
+}
+
+# When set, make_fixtures() only (re)writes the fixtures named here
+_rebuild_only: set[str] | None = None
+
+# Manifest entry holding generator_digest() as of the last full build; dot-names
+# are never fixtures
+GENERATOR_KEY = ".generator"
+
+def generator_digest() -> str:
+    """Digest of the code that decides fixture content; editing it invalidates every fixture."""
+    source = "".join(inspect.getsource(f) for f in (build_fixtures, filled_chunks))
+    return sha256(source.encode("utf-8"))
+
+def stale_fixtures() -> set[str]:
+    """Fixtures that are missing, have the wrong size, or were modified after being written.
+
+    If the generator changed since the fixtures were built, all of them are stale.
+    """
+    load_manifest()
+    if _manifest.get(GENERATOR_KEY) != generator_digest():
+        return set(EXPECTED_FIXTURES)
+    stale = set()
+    for name, (size, _sha) in EXPECTED_FIXTURES.items():  # sha is for fixture_drift()
+        path = FIX / name
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            stale.add(name)
+            continue
+        if st.st_size != size or (name in _manifest and recorded_digest(path) is None):
+            stale.add(name)
+    return stale
+
+def fixture_drift(names) -> set[str]:
+    """Those of names whose file on disk disagrees with its EXPECTED_FIXTURES entry."""
+    drift = set()
+    for name in names:
+        size, sha = EXPECTED_FIXTURES[name]
+        path = FIX / name
+        if not path.is_file() or path.stat().st_size != size or sha256_file(path) != sha:
+            drift.add(name)
+    return drift
+
+def print_manifest():
+    """Print an EXPECTED_FIXTURES table matching the fixtures make_fixtures() writes."""
+    make_fixtures_once()
+    print("EXPECTED_FIXTURES = {")
+    for path in sorted(FIX.iterdir()):
+        if not path.name.startswith("."):
+            print(f'    "{path.name}": ({path.stat().st_size}, "{sha256_file(path)}"),')
+    print("}")
+
+def make_fixtures(only: set[str] | None = None):
+    global _rebuild_only
+    _rebuild_only = only
+    try:
+        build_fixtures()
+    finally:
+        _rebuild_only = None
+
+def build_fixtures():
+    os.makedirs(FIX, exist_ok=True)
+    load_manifest()
 
-def make_fixtures():
     # 1) small.txt
     small = b"Header\nbody 1\nbody 2\nERROR hit\ntail\nERROR 2\nfoo\nHEADER\nbar\n"
     write(FIX / "small.txt", small)
@@ -55,19 +322,15 @@ def make_fixtures():
     write(FIX / "crlf.txt", b"A\r\nB\r\nC")
 
     # 5) big-forward.bin (20 MiB of 'A' with 'NEEDLE' at a deep offset)
-    big = bytearray(b"A" * (20 * 1024 * 1024))
     ins_off = 12 * 1024 * 1024 + 123 + 890
-    big[ins_off:ins_off+6] = b"NEEDLE"
-    write(FIX / "big-forward.bin", big)
+    write_filled(FIX / "big-forward.bin", 20 * 1024 * 1024, b"A", [(ins_off, b"NEEDLE")])
 
     # 6) longline-left.bin (single long line, no LF)
-    lleft = bytearray(b"A" * (12 * 1024 * 1024))
-    lleft[10_000_000:10_000_006] = b"NEEDLE"
-    write(FIX / "longline-left.bin", lleft)
+    write_filled(FIX / "longline-left.bin", 12 * 1024 * 1024, b"A", [(10_000_000, b"NEEDLE")])
 
     # 7) longline-right.bin: 32 'B', then 12 MiB of 'C', then LF, then 'TAIL\n'
-    lright = bytearray(b"B" * 32 + b"C" * (12 * 1024 * 1024) + b"\nTAIL\n")
-    write(FIX / "longline-right.bin", lright)
+    write_filled(FIX / "longline-right.bin", 32 + 12 * 1024 * 1024 + 6, b"C",
+                 [(0, b"B" * 32), (32 + 12 * 1024 * 1024, b"\nTAIL\n")])
 
     # 8) labels-evict.txt
     write(FIX / "labels-evict.txt", b"0123456789abcdefghijklmnopqrstuvwxyz")
@@ -104,7 +367,7 @@ End of document.
     write(FIX / "single-line-with-lf.txt", b"Single line with newline\n")
 
     # 13) binary-data.bin - Mixed binary and text data
-    binary_data = bytearray(b"TEXT_START\x00\x01\x02\x03BINARY_DATA\xff\xfe\xfdTEXT_END\n")
+    binary_data = b"TEXT_START\x00\x01\x02\x03BINARY_DATA\xff\xfe\xfdTEXT_END\n"
     write(FIX / "binary-data.bin", binary_data)
 
     # 14) repeated-patterns.txt
@@ -116,10 +379,7 @@ End of document.
     write(FIX / "unicode-test.txt", unicode_content)
 
     # 16) large-lines.txt - File with very long lines
-    large_lines = bytearray()
-    for i in range(10):
-        line = b"X" * 1000 + f"LINE_{i:02d}".encode() + b"Y" * 1000 + b"\n"
-        large_lines.extend(line)
+    large_lines = b"".join(b"X" * 1000 + f"LINE_{i:02d}".encode() + b"Y" * 1000 + b"\n" for i in range(10))
     write(FIX / "large-lines.txt", large_lines)
 
     # 17) nested-sections.txt - Complex nested structure
@@ -173,51 +433,48 @@ END_SECTION_B
     write(FIX / "cr-only.txt", cr_only)
 
     # 23) crlf-large.txt - Large CRLF file for buffer boundary testing
-    crlf_large = bytearray()
-    for i in range(100):
-        crlf_large.extend(f"Line {i:03d}\r\n".encode())
+    crlf_large = "".join(f"Line {i:03d}\r\n" for i in range(100)).encode("ascii")
     write(FIX / "crlf-large.txt", crlf_large)
 
     # 24) crlf-boundary.txt - CRLF sequences that will span buffer boundaries
     # Create content where CRLF sequences are positioned to test buffer boundary handling
-    crlf_boundary = bytearray(b"A" * 1000)  # Fill buffer
-    crlf_boundary.extend(b"\r\n")  # CRLF at buffer boundary
-    crlf_boundary.extend(b"B" * 1000)  # More content
-    crlf_boundary.extend(b"\r\n")  # Another CRLF
-    crlf_boundary.extend(b"C" * 1000)  # Final content
+    crlf_boundary = b"".join([
+        b"A" * 1000,  # Fill buffer
+        b"\r\n",  # CRLF at buffer boundary
+        b"B" * 1000,  # More content
+        b"\r\n",  # Another CRLF
+        b"C" * 1000,  # Final content
+    ])
     write(FIX / "crlf-boundary.txt", crlf_boundary)
 
     # 25) ops file for CLI tests
     write(FIX / "commands_take_plus_2b.txt", b"take +2b\n")
 
     # 26) binary-patterns.bin - File with various binary patterns for find:bin tests
-    bin_patterns = bytearray()
-    # PNG header
-    bin_patterns.extend(b"\x89\x50\x4E\x47\x0D\x0A\x1A\x0A")
-    bin_patterns.extend(b"SOME_TEXT_DATA_HERE")
-    # ZIP signature
-    bin_patterns.extend(b"\x50\x4B\x03\x04")
-    bin_patterns.extend(b"MORE_TEXT")
-    # CAFEBABE (Java class file)
-    bin_patterns.extend(b"\xCA\xFE\xBA\xBE")
-    bin_patterns.extend(b"PADDING")
-    # DEADBEEF pattern
-    bin_patterns.extend(b"\xDE\xAD\xBE\xEF")
-    bin_patterns.extend(b"END_DATA\n")
+    bin_patterns = b"".join([
+        b"\x89\x50\x4E\x47\x0D\x0A\x1A\x0A",  # PNG header
+        b"SOME_TEXT_DATA_HERE",
+        b"\x50\x4B\x03\x04",  # ZIP signature
+        b"MORE_TEXT",
+        b"\xCA\xFE\xBA\xBE",  # CAFEBABE (Java class file)
+        b"PADDING",
+        b"\xDE\xAD\xBE\xEF",  # DEADBEEF pattern
+        b"END_DATA\n",
+    ])
     write(FIX / "binary-patterns.bin", bin_patterns)
 
     # 27) binary-large.bin - Large binary file for buffer boundary testing
-    bin_large = bytearray(b"\x00" * (10 * 1024 * 1024))  # 10MB of zeros
-    # Insert pattern deep in the file
+    # 10MB of zeros with a pattern deep in the file
     pattern_offset = 7 * 1024 * 1024 + 12345
-    bin_large[pattern_offset:pattern_offset+4] = b"\xDE\xAD\xBE\xEF"
-    write(FIX / "binary-large.bin", bin_large)
+    write_filled(FIX / "binary-large.bin", 10 * 1024 * 1024, b"\x00",
+                 [(pattern_offset, b"\xDE\xAD\xBE\xEF")])
 
     # 28) hex-test.bin - Simple file for hex parsing tests
-    hex_test = bytearray()
-    hex_test.extend(b"PREFIX_")
-    hex_test.extend(b"\x01\x0D\xFF")  # hex: 01 0D FF
-    hex_test.extend(b"_SUFFIX")
+    hex_test = b"".join([
+        b"PREFIX_",
+        b"\x01\x0D\xFF",  # hex: 01 0D FF
+        b"_SUFFIX",
+    ])
     write(FIX / "hex-test.bin", hex_test)
 
     # 29) label-offset.txt — exercises inline offset label lookups
@@ -232,49 +489,472 @@ END_SECTION_B
     # 32) utf8-boundary.bin — multi-byte code point followed by ASCII
     write(FIX / "utf8-boundary.bin", "🚀X".encode("utf-8"))
 
+    if _rebuild_only is None or _rebuild_only >= EXPECTED_FIXTURES.keys():
+        _manifest[GENERATOR_KEY] = generator_digest()
+    save_manifest()
+
+def make_fixtures_once(only: set[str] | None = None, regen: bool = False):
+    """Regenerate fixtures (or just those in only), coordinating with concurrent runs.
+
+    The first runner to take the exclusive lock writes the fixtures. Any runner
+    started concurrently waits on a shared lock until it is done, reuses its
+    output, and only builds what is still stale afterwards.
+
+    With regen, the manifest is discarded first, so every fixture is hashed and
+    compared with its generated content before it is kept.
+    """
+    if FIX.is_symlink() and not FIX.exists():
+        # --tmpfs target was cleared, e.g. by a reboot
+        if not private_dir(Path(os.readlink(FIX))):
+            FIX.unlink()
+    FIX.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        if regen:
+            MANIFEST.unlink(missing_ok=True)
+        make_fixtures(only)
+        return
+    with open(FIX / ".lock", "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            fcntl.flock(lock, fcntl.LOCK_SH)
+            if only is not None and not regen:
+                only = stale_fixtures()
+                if not only:
+                    return
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        if regen:
+            MANIFEST.unlink(missing_ok=True)
+        make_fixtures(only)
+
+def private_dir(path: Path) -> bool:
+    """Create path as a directory only this user can use, or check that it already is one.
+
+    /dev/shm is shared: another user could pre-create the directory, or a
+    symlink with its name, and so control the fixtures a run reads.
+    """
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid():
+        print(f"WARNING: {path} is not a directory owned by you; keeping fixtures on disk", file=sys.stderr)
+        return False
+    os.chmod(path, 0o700)
+    return True
+
+def use_tmpfs_fixtures():
+    """Keep fixtures in RAM by turning FIX into a symlink to a directory under /dev/shm.
+
+    Everything else keeps addressing fixtures through FIX. Remove the symlink
+    to go back to on-disk fixtures.
+    """
+    shm = Path("/dev/shm")
+    if not shm.is_dir() or not hasattr(os, "getuid"):
+        print("WARNING: --tmpfs needs /dev/shm; keeping fixtures on disk", file=sys.stderr)
+        return
+    target = shm / f"fiskta-fixtures-{os.getuid()}"
+    if not private_dir(target):
+        return
+    if FIX.is_symlink():
+        if Path(os.readlink(FIX)) == target:
+            return
+        FIX.unlink()
+    elif FIX.exists():
+        # Drop the generated on-disk copy (it is rebuilt in RAM below), but
+        # never anything test.py did not put there
+        entries = list(FIX.iterdir())
+        if any(path.is_dir() or not (path.name in EXPECTED_FIXTURES or path.name.startswith("."))
+               for path in entries):
+            print(f"WARNING: {FIX} holds files test.py did not create; keeping fixtures on disk", file=sys.stderr)
+            return
+        for path in entries:
+            path.unlink()
+        FIX.rmdir()
+    FIX.symlink_to(target, target_is_directory=True)
+
 def sha256(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
-def run(exe: Path, tokens, in_path: str | None, stdin_data: bytes | None, extra_args=None):
+def sha256_file(path: Path) -> str:
+    """sha256() of a file's contents, without reading the whole file into memory."""
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+        return h.hexdigest()
+
+def build_argv(exe: bytes, tc: "TestCase") -> tuple[bytes, ...]:
     # Build argv: fiskta [options] [--input PATH] <tokens...>
-    argv = [str(exe)]
-    if extra_args:
-        argv.extend(extra_args)
-    if in_path is not None:
-        argv.extend(["--input", in_path])
-    argv.extend(tokens)
+    # tokens and extra_args arrive pre-encoded (see test_case()), so subprocess
+    # has nothing left to encode.
+    if tc.input_file is None:
+        input_args = ()
+    elif tc.input_file == "-":
+        input_args = (b"--input", b"-")
+    else:
+        input_args = (b"--input", os.fsencode(_FIX_PATHS[tc.input_file]))
+    return (exe, *tc.extra_args, *input_args, *tc.tokens)
+
+STREAM_CHUNK = 64 * 1024
+PIPE_MAX = 1 << 20  # default /proc/sys/fs/pipe-max-size
+
+def grow_pipe(fd: int, size: int):
+    """Ask Linux to enlarge a pipe's buffer so fewer, larger reads and writes cross it."""
+    if fcntl is not None and hasattr(fcntl, "F_SETPIPE_SZ"):
+        try:
+            fcntl.fcntl(fd, fcntl.F_SETPIPE_SZ, min(size, PIPE_MAX))
+        except OSError:
+            pass  # above the system limit; the default size still works
+
+def feed_stdin(proc: subprocess.Popen, data: bytes):
+    """Write all of data to proc's stdin in one call and close it.
+
+    fiskta spools all of stdin before it emits anything, so stdin can be
+    written in full up front without a feeder thread. On Linux the pipe is
+    first grown so a large payload goes across in a few big chunks.
+    """
+    if len(data) > STREAM_CHUNK:
+        grow_pipe(proc.stdin.fileno(), len(data))
     try:
-        proc = subprocess.run(argv, input=stdin_data, capture_output=True)
-        return proc.returncode, proc.stdout, proc.stderr
-    except FileNotFoundError:
-        print(f"ERROR: executable not found: {exe}", file=sys.stderr)
-        sys.exit(2)
+        write_all(proc.stdin.fileno(), data)
+    except BrokenPipeError:
+        pass  # exited before reading stdin, e.g. on a parse error
+    try:
+        proc.stdin.close()
+    except BrokenPipeError:
+        pass
 
-def expect_stdout(actual: bytes, expect: dict) -> tuple[bool, str]:
-    if "stdout" in expect:
-        want = expect["stdout"].encode("utf-8")
+# A test whose fiskta process outlives this is killed and reported with exit
+# code None, so a hung loop test fails by name instead of stalling the run
+TEST_TIMEOUT = 30.0
+
+class Watch:
+    """A process under the watchdog; fired is True if it had to be killed."""
+    __slots__ = ("proc", "done", "fired")
+
+    def __init__(self, proc: subprocess.Popen):
+        self.proc = proc
+        self.done = False
+        self.fired = False
+
+    def cancel(self):
+        self.done = True
+
+class Watchdog:
+    """Kills processes that outlive their deadline, from one shared thread.
+
+    A threading.Timer per test costs a thread start and switch per test,
+    which alone made an uncached run noticeably slower on one CPU.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap = []  # (deadline, seq, Watch); cancelled entries expire lazily
+        self._seq = itertools.count()
+        self._thread = None
+
+    def watch(self, proc: subprocess.Popen, timeout: float) -> Watch:
+        w = Watch(proc)
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="watchdog", daemon=True)
+                self._thread.start()
+            heapq.heappush(self._heap, (time.monotonic() + timeout, next(self._seq), w))
+            if self._heap[0][2] is w:
+                self._cond.notify()
+        return w
+
+    def _run(self):
+        with self._cond:
+            while True:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                deadline, _, w = self._heap[0]
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                heapq.heappop(self._heap)
+                if not w.done:
+                    w.fired = True
+                    w.proc.kill()
+
+WATCHDOG = Watchdog()
+
+def run(argv, stdin_data: bytes | None, timeout: float = TEST_TIMEOUT):
+    proc = subprocess.Popen(argv, stdin=subprocess.PIPE if stdin_data is not None else None,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    # The watchdog rather than communicate(timeout=), which turns every wait
+    # into a sleep-and-poll loop
+    watch = WATCHDOG.watch(proc, timeout)
+    try:
+        if stdin_data is None or len(stdin_data) <= STREAM_CHUNK:
+            out, err = proc.communicate(stdin_data)
+        else:
+            # communicate() would feed a large stdin a PIPE_BUF at a time
+            feed_stdin(proc, stdin_data)
+            with proc.stdout:
+                out = proc.stdout.read()
+            with proc.stderr:
+                err = proc.stderr.read()
+        code = proc.wait()
+    finally:
+        watch.cancel()
+    return None if watch.fired else code, out, err
+
+class StreamedStdout:
+    """Length, and optionally sha256, of a stdout stream that was not kept in memory."""
+    __slots__ = ("length", "digest")
+
+    def __init__(self, length: int, digest: str | None):
+        self.length = length
+        self.digest = digest
+
+    def __len__(self):
+        return self.length
+
+def stdout_mode(tc: "TestCase") -> str:
+    """How much of stdout tc.check() needs: "len", "sha256" or the full "bytes"."""
+    if tc.want_bytes is not None or tc.want_prefix is not None:
+        return "bytes"
+    if tc.want_sha is not None:
+        return "sha256"
+    if tc.want_len is not None:
+        return "len"
+    return "bytes"
+
+def run_streaming(argv, stdin_data: bytes | None, mode: str, timeout: float = TEST_TIMEOUT):
+    """Like run() for tests that only check stdout's length or digest.
+
+    stdout is read into one reused PIPE_MAX buffer and summarised into a
+    StreamedStdout, so multi-MiB outputs are never materialised.
+    """
+    # Unbuffered: every read below is already a large one. A grown stdout pipe
+    # lets fiskta write ahead while the previous chunk is being hashed.
+    proc = subprocess.Popen(argv, stdin=subprocess.PIPE if stdin_data is not None else None,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0)
+    watch = WATCHDOG.watch(proc, timeout)
+    try:
+        grow_pipe(proc.stdout.fileno(), PIPE_MAX)
+        if stdin_data is not None:
+            feed_stdin(proc, stdin_data)
+        h = hashlib.sha256() if mode == "sha256" else None
+        n = 0
+        buf = bytearray(PIPE_MAX)
+        view = memoryview(buf)
+        with proc.stdout:
+            while k := proc.stdout.readinto(buf):
+                n += k
+                if h is not None:
+                    h.update(view[:k])
+        # fiskta only writes a line or two of diagnostics, so stderr cannot fill
+        # its pipe while stdout is being drained.
+        with proc.stderr:
+            err = proc.stderr.read()
+        code = proc.wait()
+    finally:
+        watch.cancel()
+    if watch.fired:
+        code = None
+    return code, StreamedStdout(n, h.hexdigest() if h is not None else None), err
+
+def run_test(argv, tc: "TestCase", timeout: float = TEST_TIMEOUT):
+    mode = stdout_mode(tc)
+    if mode != "bytes":
+        return run_streaming(argv, tc.stdin, mode, timeout)
+    return run(argv, tc.stdin, timeout)
+
+def invocation_key(tc: "TestCase") -> tuple:
+    """Tests with equal keys run the same command on the same input and can share one result."""
+    return (tc.tokens, tc.input_file, tc.stdin, tc.extra_args, stdout_mode(tc))
+
+TEST_CACHE = ROOT / ".test_cache.json"
+
+def fixtures_digest() -> str:
+    """Combined digest of every fixture, taken from the manifest where it is still current.
+
+    Files the manifest has no current entry for are hashed once and recorded,
+    so later runs do not hash them again. A missing fixtures directory (a
+    --no-fixtures run on a fresh checkout) counts as an empty fixture set.
+    """
+    h = hashlib.sha256()
+    adopted = False
+    for path in sorted(FIX.iterdir()) if FIX.is_dir() else ():
+        if path.name.startswith("."):
+            continue
+        digest = recorded_digest(path)
+        if digest is None:
+            digest = fast_hash_file(path)
+            record_fixture(path, digest)
+            adopted = True
+        h.update(f"{path.name}\0{digest}\0".encode("utf-8"))
+    if adopted:
+        save_manifest()
+    return h.hexdigest()
+
+# fiskta options that put it in loop mode, where the output depends on how
+# reads line up with the wall clock
+LOOP_OPTIONS = frozenset((b"--every", b"--until-idle", b"-u", b"--for",
+                          b"--monitor", b"-m", b"--continue", b"-c",
+                          b"--follow", b"-f"))
+
+def cacheable(tc: "TestCase") -> bool:
+    """Whether a pass can be reused: slow and loop-mode tests are timing-sensitive."""
+    if tc.slow:
+        return False
+    return not any(arg.split(b"=", 1)[0] in LOOP_OPTIONS or arg.startswith(b"-u")
+                   for arg in tc.extra_args)
+
+def cache_key(tc: "TestCase") -> str:
+    # stdin enters by digest: repr() of a multi-MB payload would be built on every run
+    stdin = None if tc.stdin is None else sha256(tc.stdin)
+    spec = repr((list(tc.tokens), tc.input_file, stdin, list(tc.extra_args)))
+    return f"{tc.id}:{sha256(spec.encode('utf-8'))}"
+
+def observation(code: int, out) -> dict:
+    """What the result cache remembers about a run: enough to re-check any cacheable expectation."""
+    digest = out.digest if isinstance(out, StreamedStdout) else sha256(out)
+    return dict(exit=code, stdout_len=len(out), stdout_sha256=digest)
+
+def observation_passes(obs: dict, tc: "TestCase") -> bool:
+    if obs["exit"] != tc.want_rc:
+        return False
+    if tc.want_bytes is not None:
+        return obs["stdout_len"] == len(tc.want_bytes) and obs["stdout_sha256"] == sha256(tc.want_bytes)
+    if tc.want_prefix is not None:
+        return False  # not recoverable from a digest; always rerun
+    if tc.want_len is not None and obs["stdout_len"] != tc.want_len:
+        return False
+    if tc.want_sha is not None:
+        return obs["stdout_sha256"] == tc.want_sha
+    if tc.want_len is not None:
+        return True
+    return obs["stdout_len"] == 0
+
+def load_test_cache(exe_digest: str, fix_digest: str) -> dict:
+    """Cached observations keyed by cache_key(), valid only for this exact binary and fixture set."""
+    try:
+        data = json.loads(TEST_CACHE.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+    if data.get("exe") != exe_digest or data.get("fixtures") != fix_digest:
+        return {}
+    return data.get("results", {})
+
+def save_test_cache(exe_digest: str, fix_digest: str, results: dict):
+    data = json.dumps(dict(exe=exe_digest, fixtures=fix_digest, results=results))
+    write_atomically(TEST_CACHE, (data.encode("utf-8"),))
+
+# stdout checkers: each returns (ok, failure message) for one kind of expectation
+
+def snippet(data: bytes, n: int = 128) -> str:
+    """repr() of data, with all but the first and last n bytes elided when it is long."""
+    if len(data) <= 2 * n:
+        return repr(data)
+    return f"{data[:n]!r}...({len(data) - 2 * n}B elided)...{data[-n:]!r}"
+
+def bytes_checker(want: bytes):
+    def check(actual):
         ok = actual == want
-        return ok, "" if ok else f"stdout mismatch\n---want({len(want)}B)\n{want!r}\n---got({len(actual)}B)\n{actual!r}"
-    if "stdout_startswith" in expect:
-        prefix = expect["stdout_startswith"].encode("utf-8")
+        return ok, "" if ok else f"stdout mismatch\n---want({len(want)}B)\n{snippet(want)}\n---got({len(actual)}B)\n{snippet(actual)}"
+    return check
+
+def prefix_checker(prefix: bytes):
+    def check(actual):
         ok = actual.startswith(prefix)
-        return ok, "" if ok else f"stdout prefix mismatch\n---want-prefix({len(prefix)}B)\n{prefix!r}\n---got({len(actual)}B)\n{actual!r}"
-    if "stdout_len" in expect:
-        want_len = int(expect["stdout_len"])
+        return ok, "" if ok else f"stdout prefix mismatch\n---want-prefix({len(prefix)}B)\n{snippet(prefix)}\n---got({len(actual)}B)\n{snippet(actual)}"
+    return check
+
+def len_checker(want_len: int):
+    def check(actual):
         ok = len(actual) == want_len
         return ok, "" if ok else f"stdout_len mismatch want {want_len}, got {len(actual)}"
-    if "stdout_sha256" in expect:
-        want = expect["stdout_sha256"].lower()
-        got = sha256(actual)
+    return check
+
+def sha_checker(want: str, want_len: int | None = None):
+    def check(actual):
+        if want_len is not None and len(actual) != want_len:
+            return False, f"stdout_len mismatch want {want_len}, got {len(actual)}"
+        got = actual.digest if isinstance(actual, StreamedStdout) else sha256(actual)
         ok = got == want
         return ok, "" if ok else f"sha256 mismatch want {want}, got {got}"
-    # default: expect empty
+    return check
+
+def check_empty(actual):
     ok = len(actual) == 0
     return ok, "" if ok else f"expected empty stdout, got {len(actual)}B"
 
+@dataclass(slots=True, frozen=True)
+class TestCase:
+    """One entry of tests() with its expectation resolved up front.
+
+    tokens and extra_args are stored os.fsencode()d, ready to go into argv.
+    At most one of the want_* stdout fields is set, except that want_len may
+    accompany want_sha; if none is, stdout must be empty.
+    """
+    id: str
+    tokens: tuple[bytes, ...]
+    input_file: str | None
+    stdin: bytes | None = None
+    extra_args: tuple[bytes, ...] = ()
+    slow: bool = False
+    want_rc: int = 0
+    want_bytes: bytes | None = None
+    want_prefix: bytes | None = None
+    want_len: int | None = None
+    want_sha: str | None = None
+    # check(actual stdout) -> (ok, failure message), picked from the want_* field
+    check: Callable[[bytes], tuple[bool, str]] = field(default=check_empty, compare=False, repr=False)
+
+def as_bytes(value: str | bytes) -> bytes:
+    """Expected output as bytes; str values in the table are UTF-8 text."""
+    return value if isinstance(value, bytes) else value.encode("utf-8")
+
+def test_case(t: dict) -> TestCase:
+    expect = t["expect"]
+    want = {}
+    # Same precedence expect dicts have always had: the first key present wins
+    if "stdout" in expect:
+        want["want_bytes"] = as_bytes(expect["stdout"])
+        want["check"] = bytes_checker(want["want_bytes"])
+    elif "stdout_startswith" in expect:
+        want["want_prefix"] = as_bytes(expect["stdout_startswith"])
+        want["check"] = prefix_checker(want["want_prefix"])
+    elif "stdout_sha256" in expect:
+        # A digest may carry the length too, which fails fast and reads better
+        want["want_sha"] = expect["stdout_sha256"].lower()
+        if "stdout_len" in expect:
+            want["want_len"] = int(expect["stdout_len"])
+        want["check"] = sha_checker(want["want_sha"], want.get("want_len"))
+    elif "stdout_len" in expect:
+        want["want_len"] = int(expect["stdout_len"])
+        want["check"] = len_checker(want["want_len"])
+    return TestCase(
+        id=t["id"],
+        tokens=tuple(map(os.fsencode, t["tokens"])),
+        input_file=t.get("input_file", None),
+        stdin=t.get("stdin", None),
+        extra_args=tuple(map(os.fsencode, t.get("extra_args", ()))),
+        slow=t.get("slow", False),
+        want_rc=expect["exit"],
+        **want,
+    )
+
+def test_cases() -> tuple[TestCase, ...]:
+    return _TESTS
+
+# Large inline stdin payloads, built once rather than inside the table
+IO105_STDIN = b"A" * 1_000_000 + b"NEEDLE" + b"B" * 1_000_000
+
 def tests():
     # NOTE: Using 'THEN' as the clause separator per your decision.
     # Each test: id, tokens (without input path), in, stdin (optional), expect {stdout|stdout_len|stdout_sha256, exit}
+    # stdout may be str (compared as UTF-8) or bytes; use bytes for binary output.
     return [
         # ---------- Grammar & parsing ----------
         dict(id="gram-001-clause-sep",
@@ -397,7 +1077,8 @@ def tests():
              tokens=["find","B","take","until","C","at","line-end"], input_file="longline-right.bin",
              # Expect many bytes; just assert the last 5 bytes are 'TAIL\n' by taking until line-end then ensure the total ends with LF before TAIL won't be included (we captured up to LF).
              # Assert exact length: 32 bytes of 'B' + 12MiB of 'C' + 1 byte LF = 32 + 12*1024*1024 + 1
-             expect=dict(stdout_len=32 + 12*1024*1024 + 1, exit=0)),  # from 'B'*32 + 'C'*12MiB up to and including LF
+             expect=dict(stdout_len=32 + 12*1024*1024 + 1,  # from 'B'*32 + 'C'*12MiB up to and including LF
+                         stdout_sha256="f7b3322c6b2762c3a3ec9ca76ac962545339ad60283ab23828245a261a64b89e", exit=0)),
 
         # ---------- find semantics ----------
         dict(id="find-001-forward-first-match",
@@ -454,14 +1135,7 @@ def tests():
         dict(id="lab-003-evict-lru-on-33rd",
              tokens=[
                 # 32 labels in 32 clauses at pos 0
-                "label","A01","THEN","label","A02","THEN","label","A03","THEN","label","A04","THEN",
-                "label","A05","THEN","label","A06","THEN","label","A07","THEN","label","A08","THEN",
-                "label","A09","THEN","label","A10","THEN","label","A11","THEN","label","A12","THEN",
-                "label","A13","THEN","label","A14","THEN","label","A15","THEN","label","A16","THEN",
-                "label","A17","THEN","label","A18","THEN","label","A19","THEN","label","A20","THEN",
-                "label","A21","THEN","label","A22","THEN","label","A23","THEN","label","A24","THEN",
-                "label","A25","THEN","label","A26","THEN","label","A27","THEN","label","A28","THEN",
-                "label","A29","THEN","label","A30","THEN","label","A31","THEN","label","A32","THEN",
+                *(tok for i in range(1, 33) for tok in ("label", f"A{i:02}", "THEN")),
                 # add A33 (no eviction with direct mapping), then goto A01 succeeds
                 "label","A33","skip","to","A01","take","+1b"
              ], input_file="labels-evict.txt",
@@ -690,7 +1364,7 @@ def tests():
 
         dict(id="take-until-110-binary-data",
              tokens=["take","until","BINARY_DATA"], input_file="binary-data.bin",
-             expect=dict(stdout="TEXT_START\x00\x01\x02\x03", exit=0)),
+             expect=dict(stdout=b"TEXT_START\x00\x01\x02\x03", exit=0)),
 
         # ---------- Advanced Operations: label and goto tests ----------
         dict(id="label-101-basic",
@@ -869,7 +1543,7 @@ def tests():
 
 
         dict(id="io-105-stdin-large",
-             tokens=["find","NEEDLE","take","+6b"], input_file="-", stdin=b"A" * 1000000 + b"NEEDLE" + b"B" * 1000000,
+             tokens=["find","NEEDLE","take","+6b"], input_file="-", stdin=IO105_STDIN,
              expect=dict(stdout="NEEDLE", exit=0)),
 
         # Note: io-106-stdin-binary test is removed because it uses \x00\x01 in tokens
@@ -1581,7 +2255,7 @@ def tests():
         # Binary data patterns
         dict(id="regex-039-binary-pattern",
              tokens=["find:re","TEXT_START.*TEXT_END","take","+25b"], input_file="binary-data.bin",
-             expect=dict(stdout="TEXT_START\x00\x01\x02\x03BINARY_DATA", exit=0)),  # .* pattern works with binary data
+             expect=dict(stdout=b"TEXT_START\x00\x01\x02\x03BINARY_DATA", exit=0)),  # .* pattern works with binary data
 
         # Unicode patterns
         dict(id="regex-040-unicode-pattern",
@@ -2790,69 +3464,175 @@ def tests():
 
     ]
 
+# The test table is static: build and convert it once, at import
+_TESTS = tuple(test_case(t) for t in tests())
+_FIX_PATHS = {tc.input_file: str(FIX / tc.input_file)
+              for tc in _TESTS if tc.input_file not in (None, "-")}
+
 def main():
-    ap = argparse.ArgumentParser(description="Run fiskta v2 test suite")
-    ap.add_argument("--exe", default=str(ROOT / "fiskta"), help="Path to fiskta executable")
-    ap.add_argument("--filter", default="", help="Substring to filter test IDs")
-    ap.add_argument("--list", action="store_true", help="List tests and exit")
-    ap.add_argument("--no-fixtures", action="store_true", help="Do not regenerate fixtures")
-    ap.add_argument("--slow", action="store_true", help="Include slow tests (file growth, timing-sensitive)")
+    # Run options are accepted both with and without the explicit "run" command.
+    # Their defaults live on the top-level parser only; the subcommand copies
+    # use SUPPRESS so they cannot reset options given before the subcommand.
+    def run_options(defaults: bool) -> argparse.ArgumentParser:
+        def default(value):
+            return value if defaults else argparse.SUPPRESS
+        opts = argparse.ArgumentParser(add_help=False)
+        opts.add_argument("--exe", default=default(str(ROOT / "fiskta")), help="Path to fiskta executable")
+        opts.add_argument("--filter", default=default(""),
+                          help="Substring of the test IDs to run; may use glob wildcards, e.g. 'crlf-1??-'")
+        opts.add_argument("--list", action="store_true", default=default(False), help="List tests and exit")
+        fixture_opts = opts.add_mutually_exclusive_group()
+        fixture_opts.add_argument("--no-fixtures", action="store_true", default=default(False),
+                                  help="Do not create missing fixtures")
+        fixture_opts.add_argument("--regen-fixtures", action="store_true", default=default(False),
+                                  help="Re-verify every fixture's content, ignoring the manifest, and rewrite any that differ")
+        opts.add_argument("--tmpfs", action="store_true", default=default(False),
+                          help="Keep fixtures in /dev/shm, with fixtures/ symlinked to them")
+        opts.add_argument("--slow", action="store_true", default=default(False),
+                          help="Include slow tests (file growth, timing-sensitive)")
+        opts.add_argument("--no-cache", action="store_true", default=default(False),
+                          help="Rerun every test instead of reusing results cached for this binary and fixture set")
+        opts.add_argument("--timeout", type=float, default=default(TEST_TIMEOUT),
+                          help=f"Seconds before a test's fiskta process is killed (default: {TEST_TIMEOUT:g})")
+        opts.add_argument("--jobs", "-j", type=int, default=default(os.cpu_count() or 1),
+                          help="Number of tests to run in parallel (default: CPU count)")
+        return opts
+
+    ap = argparse.ArgumentParser(description="Run fiskta v2 test suite", parents=[run_options(True)])
+    sub = ap.add_subparsers(dest="command", metavar="{run,make-fixtures}")
+    sub.add_parser("run", parents=[run_options(False)], help="Run the test suite (default)")
+    mk = sub.add_parser("make-fixtures", help="Bring every fixture up to date and exit")
+    mk.add_argument("--tmpfs", action="store_true", default=argparse.SUPPRESS,
+                    help="Keep fixtures in /dev/shm, with fixtures/ symlinked to them")
+    mk.add_argument("--print-manifest", action="store_true",
+                    help="Also print an EXPECTED_FIXTURES table for the fixtures just written")
     args = ap.parse_args()
 
-    exe = Path(args.exe)
-    if not args.no_fixtures:
-        make_fixtures()
+    if args.tmpfs:
+        use_tmpfs_fixtures()
+
+    if args.command == "make-fixtures":
+        if args.print_manifest:
+            print_manifest()
+        else:
+            make_fixtures_once()
+        return 0
 
-    all_tests = tests()
+    # Only fixtures that are missing, resized or modified are built here;
+    # after editing make_fixtures(), run make-fixtures.
+    exe = Path(args.exe)
+    if args.regen_fixtures:
+        make_fixtures_once(regen=True)
+    elif not args.no_fixtures:
+        stale = stale_fixtures()
+        if stale:
+            make_fixtures_once(stale)
+            drift = fixture_drift(stale)
+            if drift:
+                print(f"WARNING: EXPECTED_FIXTURES is out of date for {', '.join(sorted(drift))}; "
+                      "regenerate it with `test.py make-fixtures --print-manifest`", file=sys.stderr)
+
+    all_tests = test_cases()
 
     # Filter out slow tests unless --slow is passed
     if not args.slow:
-        all_tests = [t for t in all_tests if not t.get("slow", False)]
+        all_tests = [tc for tc in all_tests if not tc.slow]
 
     if args.filter:
-        all_tests = [t for t in all_tests if args.filter in t["id"]]
+        if any(c in args.filter for c in "*?["):
+            # Unanchored, like a plain substring: the glob may match anywhere in the id
+            match = re.compile(fnmatch.translate(f"*{args.filter}*")).match
+            all_tests = [tc for tc in all_tests if match(tc.id)]
+        else:
+            needle = args.filter
+            all_tests = [tc for tc in all_tests if needle in tc.id]
 
     if args.list:
-        for t in all_tests:
-            slow_marker = " [SLOW]" if t.get("slow", False) else ""
-            print(f"{t['id']}{slow_marker}")
+        for tc in all_tests:
+            slow_marker = " [SLOW]" if tc.slow else ""
+            print(f"{tc.id}{slow_marker}")
         return 0
 
+    # Checked once here so that pool workers never have to bail out. A bare
+    # name is looked up on PATH, as subprocess would.
+    resolved = shutil.which(str(exe)) or (str(exe) if exe.is_file() and os.access(exe, os.X_OK) else None)
+    if resolved is None:
+        print(f"ERROR: executable not found or not executable: {exe}", file=sys.stderr)
+        return 2
+    exe = Path(resolved)
+
     failures = 0
     passed = 0
 
-    for t in all_tests:
-        tid = t["id"]
-        tokens = t["tokens"]
-        in_name = t.get("input_file", None)
-        stdin_data = t.get("stdin", None)
-        extra_args = t.get("extra_args", [])
-
-        if in_name is None:
-            in_path = None
-        elif in_name == "-":
-            in_path = "-"
-        else:
-            in_path = str(FIX / in_name)
-        code, out, err = run(exe, tokens, in_path, stdin_data, extra_args)
-        ok_stdout, why = expect_stdout(out, t["expect"])
-        ok_exit = (code == t["expect"]["exit"])
+    # Skip tests whose last observed result, for this exact binary and fixture
+    # set, already satisfies their expectation. Timing-sensitive tests (see
+    # cacheable()) always rerun.
+    cache = None
+    cached = set()
+    if not args.no_cache:
+        load_manifest()
+        exe_digest = sha256_file(exe)
+        fix_digest = fixtures_digest()
+        cache = load_test_cache(exe_digest, fix_digest)
+        for tc in all_tests:
+            obs = cache.get(cache_key(tc))
+            if obs is not None and cacheable(tc) and observation_passes(obs, tc):
+                cached.add(tc.id)
+
+    # Each test is an independent fiskta process, so run them concurrently and
+    # report in table order. Slow tests run one at a time once the pool has drained.
+    # Tests that make the identical invocation share a single run.
+    exe_arg = os.fsencode(exe)
+    argvs = {tc.id: build_argv(exe_arg, tc) for tc in all_tests if tc.id not in cached}
+    fast = [tc for tc in all_tests if not tc.slow and tc.id not in cached]
+    unique = {}
+    for tc in fast:
+        unique.setdefault(invocation_key(tc), tc)
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        outcomes = dict(zip(unique, pool.map(lambda tc: run_test(argvs[tc.id], tc, args.timeout), unique.values())))
+    results = {tc.id: outcomes[invocation_key(tc)] for tc in fast}
+    for tc in all_tests:
+        if tc.slow:
+            results[tc.id] = run_test(argvs[tc.id], tc, args.timeout)
+
+    # The report is assembled in memory and written in one go
+    report = []
+    for tc in all_tests:
+        tid = tc.id
+        if tid in cached:
+            report.append(f"[PASS] {tid} (cached)")
+            passed += 1
+            continue
+        code, out, err = results[tid]
+        if cache is not None and code is not None and cacheable(tc):
+            cache[cache_key(tc)] = observation(code, out)
+        ok_stdout, why = tc.check(out)
+        ok_exit = (code == tc.want_rc)
 
         if ok_stdout and ok_exit:
-            print(f"[PASS] {tid}")
+            report.append(f"[PASS] {tid}")
             passed += 1
         else:
-            print(f"[FAIL] {tid}")
-            if not ok_exit:
-                print(f"  exit: want {t['expect']['exit']}, got {code}")
+            report.append(f"[FAIL] {tid}")
+            if code is None:
+                report.append(f"  timed out after {args.timeout:g}s and was killed")
+            elif not ok_exit:
+                report.append(f"  exit: want {tc.want_rc}, got {code}")
             if not ok_stdout:
-                print(f"  {why}")
+                report.append(f"  {why}")
             if err:
-                print(f"  stderr: {err.decode('utf-8', 'ignore').strip()}")
+                report.append(f"  stderr: {err.decode('utf-8', 'ignore').strip()}")
             failures += 1
 
+    if cache is not None:
+        save_test_cache(exe_digest, fix_digest, cache)
+
     total = passed + failures
-    print(f"\nSummary: {passed}/{total} passed, {failures} failed")
+    summary = f"\nSummary: {passed}/{total} passed, {failures} failed"
+    if cached:
+        summary += f", {len(cached)} of them cached (not rerun; use --no-cache)"
+    report.append(summary + "\n")
+    sys.stdout.write("\n".join(report))
     return 1 if failures else 0
 
 if __name__ == "__main__":
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# Checks of test.py itself, as opposed to the fiskta behaviour test.py checks.
+# Standard library only. Run: python3 test_harness.py
+import os, shutil, subprocess, sys, tempfile, unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+EXE = ROOT / "fiskta"
+
+@unittest.skipUnless(EXE.is_file(), "build ./fiskta first")
+class HarnessTests(unittest.TestCase):
+    def setUp(self):
+        # A copy of test.py in an empty directory, so its fixtures/, manifest
+        # and result cache never touch the real ones
+        self.tmp = Path(tempfile.mkdtemp(prefix="fiskta-harness-"))
+        self.addCleanup(shutil.rmtree, self.tmp)
+        shutil.copy2(ROOT / "test.py", self.tmp / "test.py")
+
+    def run_harness(self, *args, env=None):
+        return subprocess.run([sys.executable, "test.py", *args], cwd=self.tmp,
+                              capture_output=True, text=True, env=env)
+
+    def test_no_fixtures_without_fixtures_dir(self):
+        proc = self.run_harness("--exe", str(EXE), "--no-fixtures")
+        self.assertNotIn("Traceback", proc.stderr)
+        self.assertIn("Summary:", proc.stdout)
+        self.assertFalse((self.tmp / "fixtures").exists())
+
+    def test_exe_found_on_path(self):
+        env = dict(os.environ, PATH=f"{EXE.parent}{os.pathsep}{os.environ.get('PATH', '')}")
+        proc = self.run_harness("--exe", EXE.name, "--no-fixtures", "--filter", "cli-", env=env)
+        self.assertNotIn("executable not found", proc.stderr)
+        self.assertIn("Summary:", proc.stdout)
+
+    def test_exe_not_executable(self):
+        exe = self.tmp / "not-executable"
+        exe.write_bytes(b"")
+        exe.chmod(0o644)
+        proc = self.run_harness("--exe", str(exe), "--no-fixtures")
+        self.assertEqual(proc.returncode, 2)
+        self.assertIn("not executable", proc.stderr)
+        self.assertNotIn("Traceback", proc.stderr)
+
+if __name__ == "__main__":
+    unittest.main()